@@ -1,26 +1,34 @@
 __all__ = [
+    'AStarSearch',
     'board',
     'Boat',
     'BreadthFirstSearch',
     'Cardinal',
     'Delta',
     'Direction',
+    'IterativeDeepeningAStarSearch',
     'Move',
     'MoveGenerator',
+    'ParallelBreadthFirstSearch',
     'Piece',
     'Position',
     'Puzzle',
     'Rotation',
     'Solution',
     'State',
+    'StateSearch',
     'Wave',
 ]
 
+from stormyseas.astar import AStarSearch
 from stormyseas.bfs import BreadthFirstSearch
 from stormyseas.directions import Direction, Cardinal, Rotation
+from stormyseas.idastar import IterativeDeepeningAStarSearch
 from stormyseas.move import Move
+from stormyseas.parallel import ParallelBreadthFirstSearch
 from stormyseas.pieces import Piece, Boat, Wave
 from stormyseas.position import Position, Delta
 from stormyseas.puzzle import Puzzle
+from stormyseas.search import StateSearch
 from stormyseas.solution import MoveGenerator, Solution
 from stormyseas.state import State
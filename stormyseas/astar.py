@@ -0,0 +1,93 @@
+from __future__ import annotations
+from heapq import heappush, heappop
+from itertools import count
+from typing import Dict, List, Tuple
+
+from stormyseas import board
+from stormyseas.pieces import Boat
+from stormyseas.position import Position
+from stormyseas.search import StateSearch
+from stormyseas.state import State
+
+
+class AStarSearch(StateSearch):
+    """Explores states in order of moves made plus the estimated moves remaining. Finds a solution with the same number
+    of moves as a breadth-first search while visiting fewer states."""
+
+    def __init__(self, initial_state: State):
+        super().__init__(initial_state)
+        self._counter = count()
+        self.queue: List[Tuple[int, int, int, State]] = []
+        self.g_scores: Dict[int, int] = {initial_state.key: 0}
+        self._push(initial_state, 0)
+
+    def find_solved_state(self) -> State:
+        logger = self._Logger(self)
+        bound = self.queue[0][0]
+        logger.state_space(bound)
+
+        while len(self.queue) > 0:
+            f_score, negative_g_score, _, self.current_state = heappop(self.queue)
+            g_score = -negative_g_score
+
+            current_key = self.current_state.key
+
+            if g_score > self.g_scores[current_key]:
+                # A shorter path to this state was found after this entry was queued.
+                continue
+
+            if State.is_solved_key(current_key):
+                logger.end()
+                return self.current_state
+
+            if f_score > bound:
+                bound = f_score
+                logger.state_space(bound)
+
+            for piece in self.get_ordered_pieces():
+                for move in self.move_templates[piece.id]:
+                    new_state = self.current_state.try_move(piece, move.direction)
+
+                    if new_state is None or not new_state.is_valid():
+                        continue
+
+                    key = new_state.key
+
+                    if key not in self.g_scores or g_score + 1 < self.g_scores[key]:
+                        self.g_scores[key] = g_score + 1
+                        self.state_map[key] = move
+                        self._push(new_state, g_score + 1)
+
+        logger.end()
+        raise Exception('Puzzle has no solution.')
+
+    @staticmethod
+    def heuristic(state: State) -> int:
+        """Manhattan distance from the front of the red boat to the port, plus one if the red boat is lined up with the
+        port but a piece is in the way. No move can shift the red boat by more than one space, and clearing the way
+        takes a move that does not bring the red boat closer, so this never overestimates the number of moves
+        remaining."""
+        red_boat = state.find_piece(Boat.RED_BOAT_ID)
+        # Optimization: The front is a single bit so its length indexes a table instead of decoding a Position.
+        distance = _PORT_DISTANCES[red_boat.front.bit_length()]
+
+        if red_boat.mask & ~_PORT_COLUMN_MASK == 0:
+            # The spaces of the port's column that are below the red boat.
+            path = _PORT_COLUMN_MASK & -(1 << red_boat.mask.bit_length())
+
+            if any(piece.mask & path for piece in state.pieces):
+                distance += 1
+
+        return distance
+
+    def _push(self, state: State, g_score: int) -> None:
+        # Ties are broken in favor of deeper states, then in insertion order to keep the search deterministic.
+        heappush(self.queue, (g_score + self.heuristic(state), -g_score, next(self._counter), state))
+
+
+_PORT_COLUMN_MASK = board.to_mask(Position(row, board.PORT[0].column) for row in range(board.HEIGHT))
+# The distance to the port from the space at each bit, indexed by the bit length of the space's mask.
+_PORT_DISTANCES: Tuple[int, ...] = (0,) + tuple(
+    abs(board.PORT[0].row - position.row) + abs(board.PORT[0].column - position.column)
+    for position in (board.to_positions(1 << index)[0] for index in range(board.SIZE))
+)
@@ -1,5 +1,69 @@
+from typing import Iterable, Tuple
+
 from stormyseas.position import Position
 
-PORT = Position(7, 5), Position(6, 5)
 WIDTH = 9
 HEIGHT = 8
+
+# Pieces are stored as bitboards: one bit per space, row by row starting from the top left. Each row has an extra
+# gutter column and the board is padded with an extra row above it so that a piece moved off the edge of the board
+# lands on a bit outside of MASK instead of wrapping around or being shifted out of the integer.
+STRIDE = WIDTH + 1
+
+
+def bit(position: Position) -> int:
+    return 1 << ((position.row + 1) * STRIDE + position.column)
+
+
+def row_to_mask(row: int, columns: int) -> int:
+    """Converts the columns of a single row, given as bits with the first column in the lowest bit, to a mask."""
+    return columns << ((row + 1) * STRIDE)
+
+
+def row_span(mask: int) -> slice:
+    """The rows from the top to the bottom of a mask. Rows above the board are left out."""
+    return slice(max(((mask & -mask).bit_length() - 1) // STRIDE - 1, 0), (mask.bit_length() - 1) // STRIDE)
+
+
+def index(mask: int) -> int:
+    """The 1-based index of the lowest bit of a mask. Pieces only ever slide, so this tells where a piece is from a
+    number that fits in INDEX_SIZE bits."""
+    return (mask & -mask).bit_length()
+
+
+def count(mask: int) -> int:
+    """The number of cells in a mask (int.bit_count requires Python 3.10)."""
+    return bin(mask).count('1')
+
+
+def to_mask(positions: Iterable[Position]) -> int:
+    mask = 0
+
+    for position in positions:
+        mask |= bit(position)
+
+    return mask
+
+
+def to_positions(mask: int) -> Tuple[Position, ...]:
+    positions = []
+    index = 0
+
+    while mask:
+        if mask & 1:
+            positions.append(Position(index // STRIDE - 1, index % STRIDE))
+
+        mask >>= 1
+        index += 1
+
+    return tuple(positions)
+
+
+# Number of bits needed to hold any mask that is on the board.
+SIZE = (HEIGHT + 1) * STRIDE
+# Number of bits needed to hold the index of any bit of a mask that is on the board.
+INDEX_SIZE = SIZE.bit_length()
+MASK = to_mask(Position(row, column) for row in range(HEIGHT) for column in range(WIDTH))
+PORT = Position(7, 5), Position(6, 5)
+PORT_MASK = to_mask(PORT)
+PORT_FRONT = bit(PORT[0])
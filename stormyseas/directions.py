@@ -3,14 +3,22 @@ from abc import abstractmethod
 from enum import Enum
 from typing import Tuple, Dict
 
+from stormyseas import board
 from stormyseas.position import Position, Delta
 
 
 class Direction(Enum):
+    transitions: Dict  # Pieces moved in this direction. (see Piece.transition) Defined after class definition.
+
     @abstractmethod
     def transform(self, positions: Tuple[Position]) -> Tuple[Position]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def shift(self, mask: int) -> int:
+        """Moves every position in a bitboard mask one space in this direction."""
+        raise NotImplementedError()
+
     @abstractmethod
     def opposite(self) -> Direction:
         raise NotImplementedError()
@@ -23,12 +31,18 @@ class Cardinal(Direction):
     RIGHT = 'R'
 
     def transform(self, positions: Tuple[Position]) -> Tuple[Position]:
-        self.DELTAS: Dict[Cardinal, Delta]  # Defined after class definition.
-        return tuple(position + self.DELTAS[self] for position in positions)
+        self.delta: Delta  # Defined after class definition.
+        row, column = self.delta
+        return tuple(Position(position.row + row, position.column + column) for position in positions)
+
+    def shift(self, mask: int) -> int:
+        self.offset: int  # Defined after class definition.
+        offset = self.offset
+        return mask << offset if offset > 0 else mask >> -offset
 
     def opposite(self) -> Direction:
-        self.OPPOSITES: Dict[Cardinal, Cardinal]  # Defined after class definition.
-        return self.OPPOSITES[self]
+        self._opposite: Cardinal  # Defined after class definition.
+        return self._opposite
 
 
 Cardinal.DELTAS = {
@@ -38,6 +52,8 @@ Cardinal.DELTAS = {
     Cardinal.DOWN: Delta(1, 0),
 }
 
+Cardinal.SHIFTS = {cardinal: delta.row * board.STRIDE + delta.column for cardinal, delta in Cardinal.DELTAS.items()}
+
 Cardinal.OPPOSITES = {
     Cardinal.LEFT: Cardinal.RIGHT,
     Cardinal.RIGHT: Cardinal.LEFT,
@@ -45,6 +61,14 @@ Cardinal.OPPOSITES = {
     Cardinal.DOWN: Cardinal.UP,
 }
 
+# Optimization: Each member keeps its own delta, shift and opposite so that moving a piece reads an attribute rather
+# than hashing the enum member (Enum.__hash__ is implemented in Python) to look it up in a dict.
+for _cardinal in Cardinal:
+    _cardinal.delta = Cardinal.DELTAS[_cardinal]
+    _cardinal.offset = Cardinal.SHIFTS[_cardinal]
+    _cardinal._opposite = Cardinal.OPPOSITES[_cardinal]
+    _cardinal.transitions = {}
+
 
 # TODO Finish implementing Rotation and how it is handled in Boat.move(), prevent rotating through a piece.
 class Rotation(Direction):
@@ -62,6 +86,10 @@ class Rotation(Direction):
 
         return front, tail
 
+    def shift(self, mask: int) -> int:
+        # A bitboard mask does not record which position is the front of the piece to rotate around.
+        raise NotImplementedError()
+
     def opposite(self) -> Direction:
         raise NotImplementedError()
 
@@ -72,3 +100,6 @@ Rotation.DELTAS = {
     Delta(-1, 0): Delta(1, -1),
     Delta(0, -1): Delta(1, 1),
 }
+
+for _rotation in Rotation:
+    _rotation.transitions = {}
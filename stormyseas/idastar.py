@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from stormyseas.astar import AStarSearch
+from stormyseas.move import Move
+from stormyseas.pieces import Piece
+from stormyseas.search import StateSearch
+from stormyseas.state import State
+
+
+class IterativeDeepeningAStarSearch(StateSearch):
+    """A depth-first version of AStarSearch that repeats the search with a growing bound on moves made plus the
+    estimated moves remaining. Only the current path and the fewest moves to each state seen in the current
+    iteration are kept in memory, at the cost of revisiting states in every iteration."""
+
+    def __init__(self, initial_state: State):
+        super().__init__(initial_state)
+        self.queue: List[State] = [initial_state]  # The current path, which is also all the state map holds.
+        # The fewest moves to reach each state seen in the current iteration.
+        self.g_scores: Dict[int, int] = {}
+
+    def find_solved_state(self) -> State:
+        logger = self._Logger(self)
+        bound = AStarSearch.heuristic(self.queue[0])
+
+        while True:
+            logger.state_space(bound)
+            next_bound = self._search(bound)
+
+            if next_bound is None:
+                logger.end()
+                return self.queue[-1]
+
+            if next_bound == float('inf'):
+                logger.end()
+                raise Exception('Puzzle has no solution.')
+
+            bound = next_bound
+
+    def _search(self, bound: int) -> Optional[float]:
+        """Searches depth first below the initial state. Returns None if a solved state was found (leaving it at the end
+        of the path), otherwise the smallest f score that exceeded the bound."""
+        next_bound = float('inf')
+        self.g_scores = {self.queue[-1].key: 0}
+        # Optimization: The untried successors of each state on the path are kept on an explicit stack rather than in
+        # recursive calls, which avoids a Python frame per depth and any limit on the depth of the path.
+        successors: List[Iterator[Tuple[State, Move]]] = []
+        state = self.queue[-1]
+
+        while True:
+            # Every state on the path before this one has an entry on the stack so its length is the g score.
+            f_score = len(successors) + AStarSearch.heuristic(state)
+
+            if f_score > bound:
+                next_bound = min(next_bound, f_score)
+                self._leave()
+            elif state.is_solved():
+                return None
+            else:
+                self.current_state = state
+                successors.append(self._valid_successors(state, self.get_ordered_pieces(), len(successors) + 1))
+
+            # Backtrack until a state on the path has an untried successor.
+            while True:
+                if not successors:
+                    return next_bound
+
+                state, move = next(successors[-1], (None, None))
+
+                if state is not None:
+                    break
+
+                successors.pop()
+
+                if successors:
+                    self._leave()
+
+            self.state_map[state.key] = move
+            self.queue.append(state)
+
+    def _valid_successors(self, state: State, pieces: List[Piece], g_score: int) -> Iterator[Tuple[State, Move]]:
+        for piece in pieces:
+            for move in self.move_templates[piece.id]:
+                new_state = state.try_move(piece, move.direction)
+
+                # States already on the current path are skipped.
+                if new_state is None or not new_state.is_valid() or new_state.key in self.state_map:
+                    continue
+
+                # Optimization: A state that was already reached in this iteration with as few moves had everything
+                # below it searched with at least as much of the bound left, so it is a transposition of a failed
+                # search.
+                if self.g_scores.get(new_state.key, g_score + 1) <= g_score:
+                    continue
+
+                self.g_scores[new_state.key] = g_score
+                yield new_state, move
+
+    def _leave(self) -> None:
+        """Removes the state at the end of the path."""
+        del self.state_map[self.queue.pop().key]
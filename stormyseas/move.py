@@ -1,10 +1,13 @@
 from __future__ import annotations
-
+from functools import lru_cache
+from sys import intern
 
 from stormyseas.directions import Direction
 
 
 class Move:
+    __slots__ = ('piece_id', 'direction', 'distance')
+
     def __init__(self, piece_id: str, direction: Direction, distance: int = 1):
         self.piece_id = piece_id
         self.direction = direction
@@ -19,10 +22,21 @@ class Move:
 
         self.distance += other.distance
 
+    def copy(self) -> Move:
+        """Moves only hold immutable values so a new instance with the same values is a complete copy."""
+        return Move(self.piece_id, self.direction, self.distance)
+
     def __str__(self) -> str:
-        # PyCharm bug (PY-16622)
-        # noinspection PyTypeChecker
-        return self.piece_id + self.direction.value + str(self.distance)
+        return _notation(self.piece_id, self.direction, self.distance)
 
     def __repr__(self) -> str:
         return self.__str__()
+
+
+@lru_cache(maxsize=None)
+def _notation(piece_id: str, direction: Direction, distance: int) -> str:
+    """Moves are merged in place so the notation is cached by value rather than on the move itself. There are only a
+    few dozen distinct moves in any puzzle."""
+    # PyCharm bug (PY-16622)
+    # noinspection PyTypeChecker
+    return intern(piece_id + direction.value + str(distance))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, chain
+from typing import Dict, List, Optional, Tuple
+
+from stormyseas.move import Move
+from stormyseas.search import StateSearch, order_pieces
+from stormyseas.state import State
+
+
+class ParallelBreadthFirstSearch(StateSearch):
+    """A breadth-first search that expands each depth in worker processes. Successors are merged back in queue order
+    so the solution found is the same as BreadthFirstSearch's. Only worthwhile on machines with several cores since
+    every state is pickled to and from a worker."""
+    WORKERS: Optional[int] = None  # Defaults to the number of processors.
+    BATCH_SIZE = 1000
+
+    def __init__(self, initial_state: State):
+        super().__init__(initial_state)
+        self.queue: List[State] = [initial_state]
+        # Optimization: Moves are numbered in the order of the move templates so that workers send and receive a small
+        # int for each move instead of a pickled Move.
+        self.moves: Tuple[Move, ...] = tuple(chain.from_iterable(self.move_templates.values()))
+        self._move_codes: List[Optional[int]] = [None]  # The code of the move that reached each state in the queue.
+
+    def find_solved_state(self) -> State:
+        logger = self._Logger(self)
+        depth = 0
+        logger.state_space(depth)
+
+        offsets = dict(zip(
+            self.move_templates.keys(),
+            accumulate(chain([0], (len(moves) for moves in self.move_templates.values())))
+        ))
+
+        with ProcessPoolExecutor(self.WORKERS, initializer=_initialize, initargs=(self.moves, offsets)) as executor:
+            while len(self.queue) > 0:
+                batches = [
+                    list(zip(self.queue[i:i + self.BATCH_SIZE], self._move_codes[i:i + self.BATCH_SIZE]))
+                    for i in range(0, len(self.queue), self.BATCH_SIZE)
+                ]
+                self.queue = []
+                self._move_codes = []
+
+                for successors in executor.map(_expand, batches):
+                    for new_state, move_code in successors:
+                        if new_state.key not in self.state_map:
+                            self.queue.append(new_state)
+                            self._move_codes.append(move_code)
+                            self.state_map[new_state.key] = self.moves[move_code]
+
+                            if State.is_solved_key(new_state.key):
+                                logger.end()
+                                return new_state
+
+                depth += 1
+                logger.state_space(depth)
+
+        logger.end()
+        raise Exception('Puzzle has no solution.')
+
+
+# Set in each worker process by _initialize.
+_moves: Tuple[Move, ...] = ()
+_offsets: Dict[str, int] = {}  # The code of each piece's first move.
+
+
+def _initialize(moves: Tuple[Move, ...], offsets: Dict[str, int]) -> None:
+    """Runs once in each worker process so the move numbering is only sent once."""
+    global _moves, _offsets
+    _moves, _offsets = moves, offsets
+
+
+def _expand(batch: List[Tuple[State, Optional[int]]]) -> List[Tuple[State, int]]:
+    """Runs in a worker process. Returns the valid successors of each state (with the code of the move that reached
+    them) in the order BreadthFirstSearch would visit them. Duplicates are left to the caller."""
+    successors = []
+
+    for state, last_move_code in batch:
+        for piece in order_pieces(state, None if last_move_code is None else _moves[last_move_code]):
+            offset = _offsets[piece.id]
+
+            for move_index, direction in enumerate(piece.directions):
+                new_state = state.try_move(piece, direction)
+
+                if new_state is not None and new_state.is_valid():
+                    successors.append((new_state, offset + move_index))
+
+    return successors
@@ -2,41 +2,66 @@ from __future__ import annotations
 from abc import abstractmethod
 from typing import NamedTuple, Tuple
 
+from stormyseas import board
 from stormyseas.directions import Direction, Rotation, Cardinal
 from stormyseas.position import Position
 
 
 class Piece(NamedTuple):
     id: str
-    positions: Tuple[Position]
+    mask: int  # Bitboard of the positions occupied by the piece. (see board.py)
+    front: int = 0  # Bitboard of the position at the front of the piece.
+    slot: int = 0  # Offset of the piece's field within State.key.
 
-    @property
-    @abstractmethod
-    def directions(self) -> Tuple[Direction, ...]:
-        """Return a list of the directions that this piece is allowed to move in. (regardless of board state)"""
-        raise NotImplementedError()
+    # The directions that this piece is allowed to move in. (regardless of board state) Defined by subclasses.
+    directions = ()
 
     @abstractmethod
     def character(self, position: Position) -> str:
         raise NotImplementedError()
 
+    @property
+    def positions(self) -> Tuple[Position, ...]:
+        """The positions occupied by the piece, starting with the front."""
+        return board.to_positions(self.front) + board.to_positions(self.mask & ~self.front)
+
     def move(self, direction: Direction) -> Piece:
-        if isinstance(direction, Rotation):
-            # my_tests later
-            raise ValueError('Rotation not supported yet')
+        return self.transition(direction)[0]
+
+    def transition(self, direction: Direction) -> Tuple[Piece, int]:
+        """Moves the piece and also returns the change to State.key (the old key_bits XOR the new key_bits)."""
+        # Optimization: A piece only has a few dozen positions so each transition is built once and looked up
+        # afterwards, like a table of successors. The table belongs to the direction since Enum.__hash__ is
+        # implemented in Python.
+        transition = direction.transitions.get(self)
 
-        if direction not in self.directions:
-            raise ValueError('Invalid move direction for ' + self.__class__.__name__ + ': ' + direction.name)
+        if transition is None:
+            # Optimization: The directions are a constant tuple of the class so this is an identity scan of a few
+            # items rather than hashing the enum member.
+            if direction not in self.directions:
+                if isinstance(direction, Rotation):
+                    # my_tests later
+                    raise ValueError('Rotation not supported yet')
 
-        positions = direction.transform(self.positions)
+                raise ValueError('Invalid move direction for ' + self.__class__.__name__ + ': ' + direction.name)
 
-        return self.__class__(self.id, positions)
+            moved_piece = self.__class__(self.id, direction.shift(self.mask), direction.shift(self.front), self.slot)
+            transition = direction.transitions[self] = moved_piece, self.key_bits ^ moved_piece.key_bits
+
+        return transition
+
+    @property
+    def key_bits(self) -> int:
+        """The piece's contribution to State.key: the index of its mask in the piece's own field of the key. Keys are
+        combined with XOR so that a move can update a key by removing the old bits of a piece and adding the new ones.
+        """
+        return board.index(self.mask) << self.slot
 
     def collides_with(self, piece: Piece) -> bool:
         # Optimization: Pieces of the same type can't push each other. Waves can only move parallel to each other and
         # will never collide. Boats can collide but there are no waves with enough room for two adjacent boats to
         # push horizontally.
-        return type(self) != type(piece) and len(set(self.positions).intersection(piece.positions)) > 0
+        return type(self) is not type(piece) and self.mask & piece.mask != 0
 
     def __str__(self) -> str:
         return '{' + self.id + ': ' + ', '.join(str(position) for position in self.positions) + '}'
@@ -46,26 +71,38 @@ class Piece(NamedTuple):
 
 
 class Boat(Piece):
+    __slots__ = ()  # Subclasses of NamedTuple need this to avoid giving every instance a __dict__.
+
     RED_BOAT_ID = 'X'
 
+    # Optimization: The directions are built once for the class rather than on every access.
+    # The game board is sized such that only 2 length boats will ever have room to rotate.
+    # + (tuple(Rotation) if len(self.positions) == 2 else ())
+    # PyCharm bug (PY-26133)
+    # noinspection PyTypeChecker
+    directions: Tuple[Direction, ...] = tuple(Cardinal)
+
     @property
-    def directions(self) -> Tuple[Direction, ...]:
-        # Optimization: The game board is sized such that only 2 length boats will ever have room to rotate.
-        # PyCharm bug (PY-26133)
-        # noinspection PyTypeChecker
-        return tuple(Cardinal)  # + (tuple(Rotation) if len(self.positions) == 2 else ())
+    def key_bits(self) -> int:
+        # The red boat's front is included so that the key can tell which way round it is in the port.
+        if self.id == self.RED_BOAT_ID:
+            return ((board.index(self.front) << board.INDEX_SIZE) | board.index(self.mask)) << self.slot
+
+        return board.index(self.mask) << self.slot
 
     def character(self, position: Position) -> str:
-        return self.RED_BOAT_ID.lower() if self.id == self.RED_BOAT_ID and self.positions[0] == position else self.id
+        is_front = self.front == board.bit(position)
+        return self.RED_BOAT_ID.lower() if self.id == self.RED_BOAT_ID and is_front else self.id
 
 
 class Wave(Piece):
+    __slots__ = ()
+
     GAP = '-'
     BLOCK = '#'
 
-    @property
-    def directions(self) -> Tuple[Direction, ...]:
-        return Cardinal.LEFT, Cardinal.RIGHT
+    directions: Tuple[Direction, ...] = (Cardinal.LEFT, Cardinal.RIGHT)
 
     def character(self, position: Position) -> str:
         return self.BLOCK
+
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Type
 
 from stormyseas.bfs import BreadthFirstSearch
+from stormyseas.search import StateSearch
 from stormyseas.solution import Solution, MoveGenerator
 from stormyseas.state import State
 
@@ -10,13 +11,15 @@ class Puzzle:
     """A class for finding solutions to Stormy Seas puzzles."""
     DO_MERGE_MOVES = True
 
-    def __init__(self, puzzle_string: str):
+    def __init__(self, puzzle_string: str, search_type: Type[StateSearch] = BreadthFirstSearch):
         self.initial_state = State.from_string(puzzle_string)
         self.final_state: Optional[State] = None
-        self._bfs = BreadthFirstSearch(self.initial_state)
+        self._search = search_type(self.initial_state)
 
     def solve(self) -> Solution:
-        """Finds the shortest set of moves to solve the puzzle using a breadth-first search of all possible states."""
-        self.final_state = self._bfs.find_solved_state()
-        move_generator = MoveGenerator(self.initial_state, self.final_state, self._bfs.state_map)
+        """Finds the shortest set of moves to solve the puzzle by searching the possible states with the search type
+        given to the constructor (a breadth-first search by default). Pass AStarSearch to visit fewer states.
+        """
+        self.final_state = self._search.find_solved_state()
+        move_generator = MoveGenerator(self.initial_state, self.final_state, self._search.state_map)
         return Solution(move_generator.generate())
@@ -0,0 +1,96 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from datetime import datetime
+from time import time
+from typing import Dict, Optional, List, Sized, Tuple
+
+from stormyseas.move import Move
+from stormyseas.pieces import Piece
+from stormyseas.state import State
+
+
+class StateSearch(ABC):
+    """Base class for searches that explore the state space of a puzzle until the red boat reaches the port."""
+    DO_LOG_PROGRESS = True  # Prints the size of the state space after each depth (or bound) of the search.
+
+    def __init__(self, initial_state: State):
+        self.current_state = initial_state
+        self.queue: Sized  # Defined by subclasses.
+        self.state_map: Dict[int, Optional[Move]] = {initial_state.key: None}
+        # Optimization: Pieces never change identity so each one's candidate moves are built once and shared by every
+        # state. Moves in the state map must therefore never be modified.
+        self.move_templates: Dict[str, Tuple[Move, ...]] = {
+            piece.id: tuple(Move(piece.id, direction) for direction in piece.directions)
+            for piece in initial_state.pieces
+        }
+
+    @abstractmethod
+    def find_solved_state(self) -> State:
+        """Searches until a solved state is found. The state map (keyed by State.key) must lead from the solved state
+        back to the initial state when this returns.
+        """
+        raise NotImplementedError()
+
+    def get_ordered_pieces(self) -> List[Piece]:
+        return order_pieces(self.current_state, self.state_map[self.current_state.key])
+
+    class _Logger:
+        def __init__(self, state_search: StateSearch):
+            self._state_search = state_search
+            self._enabled = state_search.DO_LOG_PROGRESS
+            self._start_time = time()
+            self._previous_move_time = self._start_time
+            self._previous_states_length = 0
+            self._previous_queue_length = 0
+
+            if self._enabled:
+                print('Started solving at: %s' % datetime.fromtimestamp(self._start_time).strftime('%X'))
+
+        def state_space(self, depth: int) -> None:
+            if not self._enabled:
+                return
+
+            total_seconds = time() - self._start_time
+            delta_seconds = time() - self._previous_move_time
+
+            print(
+                'depth=%-2d  states=%-6d%+-5d  queue=%-4d  %+-5d  time=%dm %-3s  %+dm %ds' %
+                (
+                    depth,
+                    len(self._state_search.state_map),
+                    len(self._state_search.state_map) - self._previous_states_length,
+                    len(self._state_search.queue),
+                    len(self._state_search.queue) - self._previous_queue_length,
+                    total_seconds // 60,
+                    str(round(total_seconds % 60)) + 's',
+                    delta_seconds // 60,
+                    delta_seconds % 60,
+                )
+            )
+
+            self._previous_move_time = time()
+            self._previous_states_length = len(self._state_search.state_map)
+            self._previous_queue_length = len(self._state_search.queue)
+
+        def end(self) -> None:
+            if not self._enabled:
+                return
+
+            seconds = time() - self._start_time
+            print('Finished solving at: %s' % datetime.fromtimestamp(time()).strftime('%X'))
+            print('Total Time Elapsed: %dm %ds' % (seconds // 60, seconds % 60))
+            print('Scanned %s states with %s left in the queue.' %
+                  ("{:,}".format(len(self._state_search.state_map)), "{:,}".format(len(self._state_search.queue))))
+
+
+def order_pieces(state: State, last_move: Optional[Move]) -> List[Piece]:
+    """Orders the pieces so that the piece most recently moved is at the front of the list. This optimizes the
+    number of steps in the final solution by increasing the chances of being able to merge moves."""
+    pieces = list(state.pieces)
+
+    if last_move is not None:
+        last_moved_piece = state.find_piece(last_move.piece_id)
+        pieces.remove(last_moved_piece)
+        pieces.insert(0, last_moved_piece)
+
+    return pieces
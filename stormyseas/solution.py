@@ -7,6 +7,8 @@ from stormyseas.state import State
 
 
 class Solution:
+    __slots__ = ('moves',)
+
     def __init__(self, moves: List[Move]):
         self.moves = moves
 
@@ -19,11 +21,12 @@ class Solution:
         return sum(move.distance for move in self.moves)
 
     def __str__(self) -> str:
-        return ', '.join(str(move) for move in self.moves)
+        # Optimization: join builds a list from a generator anyway so hand it one directly.
+        return ', '.join([str(move) for move in self.moves])
 
 
 class MoveGenerator:
-    def __init__(self, initial_state: State, final_state: State, state_map: Dict[State, Move]):
+    def __init__(self, initial_state: State, final_state: State, state_map: Dict[int, Move]):
         self.initial_state = initial_state
         self.final_state = final_state
         self.state_map = state_map
@@ -37,15 +40,18 @@ class MoveGenerator:
 
         current_state = self.final_state
 
-        while current_state != self.initial_state:
-            previous_move = self.state_map[current_state]
+        while current_state.key != self.initial_state.key:
+            previous_move = self.state_map[current_state.key]
 
-            if len(moves) > 0 and moves[0].can_merge_with(previous_move):
-                moves[0].merge(previous_move)
+            # Moves are found from last to first so they are appended and reversed at the end.
+            if len(moves) > 0 and moves[-1].can_merge_with(previous_move):
+                moves[-1].merge(previous_move)
             else:
-                moves.insert(0, previous_move)
+                # Moves in the state map are shared between states so merge into a copy.
+                moves.append(previous_move.copy())
 
             piece = current_state.find_piece(previous_move.piece_id)
             current_state = current_state.undo(piece, previous_move.direction)
 
+        moves.reverse()
         return moves
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from collections import deque, defaultdict
-from itertools import chain
-from typing import NamedTuple, Tuple, Iterable, Dict, List
+from itertools import chain, count
+from string import ascii_letters
+from typing import NamedTuple, Tuple, Iterable, Dict, List, Optional
 
 from stormyseas import board
 from stormyseas.directions import Direction, Cardinal, Rotation
@@ -11,48 +12,89 @@ from stormyseas.position import Position
 
 class State(NamedTuple):
     """Stores state information about the pieces on the board and manages execution of moves."""
-    pieces: Tuple[Piece]
+    pieces: Tuple[Piece]  # The wave of each row, in row order, followed by the boats.
+    key: int  # Packs every piece's Piece.key_bits into one integer that uniquely identifies a valid state.
+    indexes: Dict[str, int]  # The index of each piece in pieces by id. Pieces never change order so this is shared.
+    occupied: int  # The XOR of every piece's mask. A cell covered by two pieces cancels out (see is_valid).
+    size: int  # The number of cells covered by all pieces, which never changes.
 
     @staticmethod
     def from_string(state_string: str) -> State:
         pieces: Dict[str, Piece] = {}
-        boat_positions: Dict[str, List[Position]] = defaultdict(lambda: [])
+        boat_positions: Dict[str, List[Position]] = defaultdict(list)
+        # Optimization: Every piece has a field of INDEX_SIZE bits in the key, which keeps keys small enough to hash
+        # and store cheaply. The red boat's index and front always take the first two fields so that is_solved_key
+        # can find them.
+        slots = (slot * board.INDEX_SIZE for slot in count(2))
 
-        for row, line in enumerate(state_string.strip().split('\n')):
-            wave_positions = []
+        lines = state_string.strip().split('\n')
+
+        # Constraint: The pushes rely on pieces starting with exactly one wave per row of the board. (see _push)
+        if len(lines) != board.HEIGHT:
+            raise ValueError('The puzzle must have %d rows but has %d.' % (board.HEIGHT, len(lines)))
+
+        for row, line in enumerate(lines):
+            line = line.strip()
 
             character: str  # PyCharm bug (PY-42194)
-            for column, character in enumerate(line.strip()):
-                if character == Wave.BLOCK:
-                    wave_positions.append(Position(row, column))
-                elif character != Wave.GAP:
+            for column, character in enumerate(line):
+                if character != Wave.BLOCK and character != Wave.GAP:
                     if character.islower():
                         # The first position should be the front of the boat.
                         boat_positions[character.upper()].insert(0, Position(row, column))
                     else:
                         boat_positions[character.upper()].append(Position(row, column))
 
+            # Optimization: Translating the row to binary digits (first column last) reads every block in one call.
+            digits = line.translate(_WAVE_DIGITS)
+
+            if digits.strip('01'):
+                raise ValueError('Invalid character in row %d of the puzzle: %s' % (row + 1, line))
+
+            # An empty row is a wave without any blocks.
+            wave_columns = int(digits[::-1] or '0', 2)
+
             # Constraint: Rows are 1-based in solution notation so add 1 to the id.
-            pieces[str(row + 1)] = Wave(str(row + 1), tuple(wave_positions))
+            pieces[str(row + 1)] = Wave(str(row + 1), board.row_to_mask(row, wave_columns), 0, next(slots))
 
         for id_, positions in boat_positions.items():
-            pieces[id_] = Boat(id_, tuple(positions))
+            slot = 0 if id_ == Boat.RED_BOAT_ID else next(slots)
+            pieces[id_] = Boat(id_, board.to_mask(positions), board.bit(positions[0]), slot)
+
+        key = 0
+        occupied = 0
+        size = 0
 
-        return State(tuple(pieces.values()))
+        for piece in pieces.values():
+            key ^= piece.key_bits
+            occupied ^= piece.mask
+            size += board.count(piece.mask)
+
+        return State(tuple(pieces.values()), key, {id_: index for index, id_ in enumerate(pieces)}, occupied, size)
+
+    @staticmethod
+    def is_solved_key(key: int) -> bool:
+        """Checks if the red boat is in the port using only a key from State.key."""
+        return key & _RED_BOAT_KEY_MASK == _SOLVED_RED_BOAT_KEY
 
     def is_valid(self) -> bool:
-        return not self.has_collision() and not self.has_piece_out_of_bounds()
+        # Optimization: Pieces only collide if some of their cells cancel out in the occupied mask, which is kept up to
+        # date by each move, so both checks are a few integer operations rather than a pass over the pieces.
+        return self.occupied & ~board.MASK == 0 and board.count(self.occupied) == self.size
 
     def has_collision(self) -> bool:
-        positions_list = list(self.all_positions)
-        return len(positions_list) != len(set(positions_list))
+        occupied = 0
+
+        for piece in self.pieces:
+            if occupied & piece.mask:
+                return True
+
+            occupied |= piece.mask
+
+        return False
 
     def has_piece_out_of_bounds(self) -> bool:
-        all_rows, all_columns = zip(*((position.row, position.column) for position in self.all_positions))
-        return (
-                min(all_rows) < 0 or max(all_rows) >= board.HEIGHT
-                or min(all_columns) < 0 or max(all_columns) >= board.WIDTH
-        )
+        return any(piece.mask & ~board.MASK for piece in self.pieces)
 
     @property
     def all_positions(self) -> Iterable[Position]:
@@ -60,50 +102,125 @@ class State(NamedTuple):
 
     def is_solved(self) -> bool:
         """Checks if the red boat has reached the finish position (the port)."""
-        return self.find_piece(Boat.RED_BOAT_ID).positions == board.PORT
+        return self.is_solved_key(self.key)
 
     def find_piece(self, id_: str) -> Piece:
-        return next(piece for piece in self.pieces if piece.id == id_)
+        return self.pieces[self.indexes[id_]]
 
     def move(self, piece: Piece, direction: Direction) -> State:
         """Moves the piece in the direction and returns a new state. Handles moving multiple pieces at a time if they
-        push each other.
+        push each other. The piece is looked up by id, so it must be the piece at its current position in this state.
+        Check the new state with is_valid before using it. A move that is rejected early (see try_move) returns a state
+        where only the piece itself is moved, which is never valid. A push that finishes with pieces overlapping may be
+        left partly pushed.
+        """
+        new_state = self.try_move(piece, direction)
+
+        if new_state is None:
+            # The move was rejected before its state was built so the invalid state only moves the piece itself.
+            return self._replace_piece(piece, *piece.transition(direction))
+
+        return new_state
+
+    def try_move(self, piece: Piece, direction: Direction) -> Optional[State]:
+        """Same as move but returns None instead of building the new state if the move is found to be invalid early.
+        A returned state must still be checked with is_valid.
         """
-        if direction in (Cardinal.UP, Cardinal.DOWN, Rotation.COUNTER_CLOCKWISE):
+        if direction in _UNPUSHED_DIRECTIONS:
             # Optimization: There is no need to push pieces vertically since waves are not capable of vertical movement
             # and a boat pushing a boat is equivalent to moving one boat and then the other.
-            return State(self._push_without_collision(piece, direction))
+            return self._push_without_collision(piece, direction)
         else:
-            return State(self._push(piece, direction))
+            return self._push(piece, direction)
 
     def undo(self, piece: Piece, direction: Direction) -> State:
         return self.move(piece, direction.opposite())
 
-    def _push_without_collision(self, piece: Piece, direction: Direction) -> Tuple[Piece]:
-        old_piece, new_piece = piece, piece.move(direction)
-        return tuple(new_piece if piece.id == new_piece.id else piece for piece in self.pieces)
+    def _push_without_collision(self, piece: Piece, direction: Direction) -> Optional[State]:
+        new_piece, key_change = piece.transition(direction)
+
+        # Optimization: A move onto another piece or off the board is rejected before its state is built.
+        if new_piece.mask & (self.occupied ^ piece.mask | ~board.MASK):
+            return None
 
-    def _push(self, piece: Piece, direction: Direction) -> Tuple[Piece]:
+        return self._replace_piece(piece, new_piece, key_change)
+
+    def _replace_piece(self, piece: Piece, new_piece: Piece, key_change: int) -> State:
+        # Optimization: The moved piece is replaced by its index rather than by comparing every piece.
         pieces = list(self.pieces)
+        pieces[self.indexes[piece.id]] = new_piece
+        return State(
+            tuple(pieces),
+            # Optimization: Only the moved piece's bits of the key change.
+            self.key ^ key_change,
+            self.indexes,
+            self.occupied ^ piece.mask ^ new_piece.mask,
+            self.size,
+        )
+
+    def _push(self, piece: Piece, direction: Direction) -> Optional[State]:
+        new_piece, key_change = piece.transition(direction)
+
+        # Optimization: Most moves don't reach another piece, which is a single check against the occupied mask since
+        # the other pieces of a valid state never overlap. Only a move that reaches a piece needs the cascade below,
+        # which checks the bounds of every pushed piece including this one.
+        if new_piece.mask & (self.occupied ^ piece.mask) == 0:
+            if new_piece.mask & ~board.MASK:
+                return None
+
+            return self._replace_piece(piece, new_piece, key_change)
+
+        pieces = list(self.pieces)
+        indexes = self.indexes
+        key = self.key
+        occupied = self.occupied
         queue = deque([piece])
+        # Optimization: Membership of the ids in a set is checked in constant time rather than comparing the pieces in
+        # the queue. Pieces that were already pushed stay in the set since they can't be pushed twice.
+        queued_ids = {piece.id}
 
         while queue:
             old_piece = queue.popleft()
 
-            new_piece = old_piece.move(direction)
-            pieces[pieces.index(old_piece)] = new_piece
-
-            for other_piece in pieces:
-                if other_piece not in queue and new_piece.collides_with(other_piece):
+            new_piece, key_change = old_piece.transition(direction)
+            pieces[indexes[old_piece.id]] = new_piece
+            key ^= key_change
+            occupied ^= old_piece.mask ^ new_piece.mask
+
+            if new_piece.mask & ~board.MASK:
+                # Optimization: A piece pushed off the board makes the state invalid so the rest of the push is skipped.
+                return None
+
+            # Optimization: Only pieces of different types can push each other (see Piece.collides_with). A wave can
+            # only push boats and a boat can only push the waves in the rows it spans, which are indexed by row since
+            # from_string always creates one wave per row of the board before the boats.
+            if isinstance(new_piece, Wave):
+                other_pieces = pieces[board.HEIGHT:]
+            else:
+                other_pieces = pieces[board.row_span(new_piece.mask)]
+
+            for other_piece in other_pieces:
+                if other_piece.mask & new_piece.mask and other_piece.id not in queued_ids:
                     queue.append(other_piece)
+                    queued_ids.add(other_piece.id)
 
-        return tuple(pieces)
+        return State(tuple(pieces), key, self.indexes, occupied, self.size)
 
     def __str__(self) -> str:
-        board_matrix = [[Wave.GAP] * board.WIDTH for _ in range(board.HEIGHT)]
+        # One byte per space rather than a list of lists of single character strings.
+        cells = bytearray(Wave.GAP * (board.WIDTH * board.HEIGHT), 'ascii')
 
         for piece in self.pieces:
             for position in piece.positions:
-                board_matrix[position.row][position.column] = piece.character(position)
+                cells[position.row * board.WIDTH + position.column] = ord(piece.character(position))
+
+        return '\n'.join(
+            cells[row * board.WIDTH:(row + 1) * board.WIDTH].decode('ascii') for row in range(board.HEIGHT)
+        )
+
 
-        return '\n'.join(''.join(row) for row in board_matrix)
+# Optimization: A constant tuple avoids looking up each enum member on every move.
+_UNPUSHED_DIRECTIONS = (Cardinal.UP, Cardinal.DOWN, Rotation.COUNTER_CLOCKWISE)
+_WAVE_DIGITS = str.maketrans({**dict.fromkeys(ascii_letters + Wave.GAP, '0'), Wave.BLOCK: '1'})
+_RED_BOAT_KEY_MASK = (1 << 2 * board.INDEX_SIZE) - 1
+_SOLVED_RED_BOAT_KEY = (board.index(board.PORT_FRONT) << board.INDEX_SIZE) | board.index(board.PORT_MASK)
@@ -0,0 +1,13 @@
+from stormyseas import AStarSearch, Puzzle
+
+from tests.utilities import StormySeasTest, Asset
+
+
+class TestAStarSearch(StormySeasTest):
+    def test_card_3(self):
+        solution = Puzzle(Asset.CARD_3.input, AStarSearch).solve()  # 16s
+        self.assertMoveCountEqual(Asset.CARD_3.output, solution)
+
+    def test_card_10(self):
+        solution = Puzzle(Asset.CARD_10.input, AStarSearch).solve()  # 5s
+        self.assertMoveCountEqual(Asset.CARD_10.output, solution)
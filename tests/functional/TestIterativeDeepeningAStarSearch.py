@@ -0,0 +1,13 @@
+from stormyseas import IterativeDeepeningAStarSearch, Puzzle
+
+from tests.utilities import StormySeasTest, Asset
+
+
+class TestIterativeDeepeningAStarSearch(StormySeasTest):
+    def test_card_3_step_12(self):
+        solution = Puzzle(Asset.CARD_3_STEP_12.input, IterativeDeepeningAStarSearch).solve()  # 0s
+        self.assertSolutionEqual(Asset.CARD_3_STEP_12.output, solution)
+
+    def test_card_10(self):
+        solution = Puzzle(Asset.CARD_10.input, IterativeDeepeningAStarSearch).solve()  # 6s
+        self.assertSolutionEqual(Asset.CARD_10.output, solution)
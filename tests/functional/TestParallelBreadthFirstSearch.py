@@ -0,0 +1,9 @@
+from stormyseas import ParallelBreadthFirstSearch, Puzzle
+
+from tests.utilities import StormySeasTest, Asset
+
+
+class TestParallelBreadthFirstSearch(StormySeasTest):
+    def test_card_10(self):
+        solution = Puzzle(Asset.CARD_10.input, ParallelBreadthFirstSearch).solve()  # 6s (single core)
+        self.assertSolutionEqual(Asset.CARD_10.output, solution)